@@ -11,8 +11,11 @@ import pandas as pd
 import numpy as np
 import json
 import os
+import tempfile
 from sklearn.preprocessing import MinMaxScaler
 
+from excel_export import DEFAULT_LAYOUT, TOP_30_LAYOUT, export_workbook
+
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 
 
@@ -259,6 +262,59 @@ def generate_dashboard_data(df, top_30):
     return dashboard
 
 
+def write_dashboard_json(dashboard_data):
+    """Write the dashboard JSON consumed by the web UI.
+
+    Written to a temp file and swapped in, so a page load during watch-mode
+    re-analysis never sees a half-written file.
+    """
+    dashboard_path = os.path.join(DATA_DIR, "dashboard_data.json")
+    fd, tmp_path = tempfile.mkstemp(dir=DATA_DIR, prefix=".dashboard_data.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(dashboard_data, f, ensure_ascii=False, indent=2)
+        # mkstemp creates the file as 0600; keep it readable like the other outputs
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, dashboard_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    print(f"   ✅ Dashboard JSON: {dashboard_path}")
+
+
+def write_excel_report(df):
+    """Full multi-sheet Excel report (ranked universe + per-category/AMC/manager sheets)."""
+    report_xlsx = os.path.join(DATA_DIR, "mutual_funds_report.xlsx")
+    sheets = export_workbook(df, report_xlsx, DEFAULT_LAYOUT)
+    print(f"   ✅ Excel report ({sheets} sheets): {report_xlsx}")
+
+
+def save_outputs(df, top_30):
+    """Write processed CSV, Top 30 CSV/Excel and the dashboard JSON. Returns the dashboard data."""
+    print("\n💾 Saving outputs...")
+
+    # Processed CSV
+    processed_path = os.path.join(DATA_DIR, "mutual_funds_processed.csv")
+    df.to_csv(processed_path, index=False)
+    print(f"   ✅ Processed data: {processed_path}")
+
+    # Top 30 CSV
+    top30_path = os.path.join(DATA_DIR, "top_30_mutual_funds.csv")
+    top_30.to_csv(top30_path, index=False)
+    print(f"   ✅ Top 30 funds: {top30_path}")
+
+    # Top 30 Excel
+    top30_xlsx = os.path.join(DATA_DIR, "top_30_mutual_funds.xlsx")
+    export_workbook(top_30, top30_xlsx, TOP_30_LAYOUT)
+    print(f"   ✅ Top 30 Excel: {top30_xlsx}")
+
+    # Dashboard JSON
+    dashboard_data = generate_dashboard_data(df, top_30)
+    write_dashboard_json(dashboard_data)
+
+    return dashboard_data
+
+
 def main():
     print("=" * 60)
     print("  📊 MUTUAL FUND ANALYSIS")
@@ -283,29 +339,8 @@ def main():
     top_30 = extract_top_30(df)
 
     # ── Save outputs ──
-    print("\n💾 Saving outputs...")
-
-    # Processed CSV
-    processed_path = os.path.join(DATA_DIR, "mutual_funds_processed.csv")
-    df.to_csv(processed_path, index=False)
-    print(f"   ✅ Processed data: {processed_path}")
-
-    # Top 30 CSV
-    top30_path = os.path.join(DATA_DIR, "top_30_mutual_funds.csv")
-    top_30.to_csv(top30_path, index=False)
-    print(f"   ✅ Top 30 funds: {top30_path}")
-
-    # Top 30 Excel
-    top30_xlsx = os.path.join(DATA_DIR, "top_30_mutual_funds.xlsx")
-    top_30.to_excel(top30_xlsx, index=False, sheet_name="Top 30 Funds")
-    print(f"   ✅ Top 30 Excel: {top30_xlsx}")
-
-    # Dashboard JSON
-    dashboard_data = generate_dashboard_data(df, top_30)
-    dashboard_path = os.path.join(DATA_DIR, "dashboard_data.json")
-    with open(dashboard_path, "w", encoding="utf-8") as f:
-        json.dump(dashboard_data, f, ensure_ascii=False, indent=2)
-    print(f"   ✅ Dashboard JSON: {dashboard_path}")
+    save_outputs(df, top_30)
+    write_excel_report(df)
 
     print("\n" + "=" * 60)
     print("  ✅ ANALYSIS COMPLETE!")
@@ -0,0 +1,310 @@
+"""
+Excel Report Export
+- Streams rows into an openpyxl write-only workbook in chunks
+- Configurable sheet layout (ranked universe, per-category / AMC / manager sheets, summaries)
+- Converts row chunks in a bounded thread window ahead of the (single-threaded) writer
+- Benchmarks time & peak memory against the DataFrame.to_excel path
+Run: python analysis/excel_export.py [--layout layout.json] [--benchmark]
+"""
+
+import argparse
+import json
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+CHUNK_SIZE = 5000
+MAX_SHEET_NAME = 31
+
+FUND_COLUMNS = [
+    "Rank", "Scheme Name", "AMC Name", "Fund Type", "Category",
+    "Sub Category", "Risk Level", "Fund Rating",
+    "Return 1Y (%)", "Return 3Y (%)", "Return 5Y (%)",
+    "Expense Ratio (%)", "NAV (₹)", "AUM (Cr)",
+    "Fund Age (Years)", "Min SIP (₹)", "Min Lumpsum (₹)",
+    "Fund Manager", "Investment Strategy", "Score"
+]
+
+# ── Sheet layouts ──
+# kind "funds":   one row per fund, sorted by Rank. Optional "columns", "limit",
+#                 and "split_by" (one sheet per distinct value, named "<name> - <value>").
+# kind "summary": one row per "group_by" value with counts, AUM and averages.
+TOP_30_LAYOUT = [
+    {"name": "Top 30 Funds", "kind": "funds", "limit": 30},
+]
+
+DEFAULT_LAYOUT = [
+    {"name": "Top 30 Funds", "kind": "funds", "columns": FUND_COLUMNS, "limit": 30},
+    {"name": "Ranked Universe", "kind": "funds", "columns": FUND_COLUMNS},
+    {"name": "Category Summary", "kind": "summary", "group_by": "Category"},
+    {"name": "AMC Summary", "kind": "summary", "group_by": "AMC Name"},
+    {"name": "Manager Summary", "kind": "summary", "group_by": "Fund Manager"},
+    {"name": "Cat", "kind": "funds", "columns": FUND_COLUMNS, "split_by": "Category"},
+    {"name": "AMC", "kind": "funds", "columns": FUND_COLUMNS, "split_by": "AMC Name"},
+    {"name": "Mgr", "kind": "funds", "columns": FUND_COLUMNS, "split_by": "Fund Manager"},
+]
+
+
+SUMMARY_COLUMNS = ["Scheme Name", "AUM (Cr)", "Return 1Y (%)", "Return 3Y (%)",
+                   "Return 5Y (%)", "Expense Ratio (%)", "Score", "Rank"]
+
+
+def load_layout(path):
+    """Load a sheet layout (list of sheet specs) from a JSON file."""
+    with open(path, encoding="utf-8") as f:
+        layout = json.load(f)
+    if not isinstance(layout, list):
+        raise ValueError("Layout must be a JSON list of sheet specs")
+    for spec in layout:
+        if not isinstance(spec, dict) or not spec.get("name"):
+            raise ValueError(f"Sheet spec needs a non-empty 'name': {spec!r}")
+        if spec.get("kind") not in ("funds", "summary"):
+            raise ValueError(f"Sheet spec {spec['name']!r}: unknown kind {spec.get('kind')!r}")
+        if spec["kind"] == "summary" and "group_by" not in spec:
+            raise ValueError(f"Summary sheet {spec['name']!r} needs a 'group_by' column")
+        limit = spec.get("limit")
+        if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 1):
+            raise ValueError(f"Sheet spec {spec['name']!r}: 'limit' must be a positive integer, got {limit!r}")
+        columns = spec.get("columns")
+        if columns is not None and (not isinstance(columns, list)
+                                    or not all(isinstance(col, str) for col in columns)):
+            raise ValueError(f"Sheet spec {spec['name']!r}: 'columns' must be a list of column names")
+        for key in ("group_by", "split_by"):
+            if key in spec and not isinstance(spec[key], str):
+                raise ValueError(f"Sheet spec {spec['name']!r}: {key!r} must be a column name")
+    return layout
+
+
+def validate_layout(layout, columns):
+    """Check every column a layout refers to exists in the data, before any sheet is built."""
+    columns = set(columns)
+    for spec in layout:
+        if spec["kind"] == "summary":
+            needed = [spec["group_by"]] + SUMMARY_COLUMNS
+        else:
+            needed = list(spec.get("columns") or [])
+            if spec.get("split_by"):
+                needed.append(spec["split_by"])
+        missing = [col for col in needed if col not in columns]
+        if missing:
+            raise ValueError(f"Sheet spec {spec['name']!r} refers to unknown column(s): {', '.join(missing)}")
+
+
+def sheet_title(name, used):
+    """Excel-safe, unique sheet title (max 31 chars, no []:*?/\\, no leading/trailing ' or spaces)."""
+    title = re.sub(r"[\[\]:*?/\\]", "-", str(name))[:MAX_SHEET_NAME].strip(" '") or "Sheet"
+    base, n = title, 2
+    while title.lower() in used:
+        suffix = f" ({n})"
+        title = base[:MAX_SHEET_NAME - len(suffix)].rstrip(" '") + suffix
+        n += 1
+    used.add(title.lower())
+    return title
+
+
+def fund_sheet(df, spec, positions):
+    """A 'funds' sheet as a view: (source, columns, row positions) — no copy of the rows."""
+    if spec.get("limit"):
+        positions = positions[:spec["limit"]]
+    return df, spec.get("columns") or list(df.columns), positions
+
+
+def summary_sheet(df, spec, positions=None):
+    """A 'summary' sheet: one aggregated row per group."""
+    key = spec["group_by"]
+    summary = df.groupby(key).agg(**{
+        "Fund Count": ("Scheme Name", "count"),
+        "Total AUM (Cr)": ("AUM (Cr)", "sum"),
+        "Avg Return 1Y (%)": ("Return 1Y (%)", "mean"),
+        "Avg Return 3Y (%)": ("Return 3Y (%)", "mean"),
+        "Avg Return 5Y (%)": ("Return 5Y (%)", "mean"),
+        "Avg Expense Ratio (%)": ("Expense Ratio (%)", "mean"),
+        "Avg Score": ("Score", "mean"),
+        "Best Rank": ("Rank", "min"),
+    }).round(2)
+    summary = summary.sort_values("Best Rank").reset_index()
+    return summary, list(summary.columns), np.arange(len(summary))
+
+
+def expand_layout(df, layout):
+    """Turn a layout into a flat list of (title, builder, spec, positions) jobs, one per output sheet.
+
+    Fund sheets are row positions into `df` in Rank order; split sheets take
+    their positions from the group index instead of copying each group.
+    """
+    if "Rank" in df.columns:
+        order = np.argsort(df["Rank"].to_numpy(), kind="stable")
+    else:
+        order = np.arange(len(df))
+    rank_pos = np.empty(len(df), dtype=np.int64)
+    rank_pos[order] = np.arange(len(df))
+
+    used = set()
+    jobs = []
+    for spec in layout:
+        if spec["kind"] == "summary":
+            jobs.append((sheet_title(spec["name"], used), summary_sheet, spec, None))
+        elif spec.get("split_by"):
+            for value, idx in sorted(df.groupby(spec["split_by"]).indices.items()):
+                positions = idx[np.argsort(rank_pos[idx], kind="stable")]
+                # Same shortening as the dashboard ("SBI Mutual Fund" → "SBI")
+                label = str(value).replace(" Mutual Fund", "")
+                jobs.append((sheet_title(f"{spec['name']} - {label}", used), fund_sheet, spec, positions))
+        else:
+            jobs.append((sheet_title(spec["name"], used), fund_sheet, spec, order))
+    return jobs
+
+
+def _rows(source, columns, positions):
+    """Materialise one chunk as plain Python rows (NaN → empty cell). Returns (columns, rows)."""
+    chunk = source.iloc[positions, source.columns.get_indexer(columns)].astype(object)
+    return columns, chunk.where(chunk.notna(), None).values.tolist()
+
+
+def _summary_rows(df, spec):
+    return _rows(*summary_sheet(df, spec))
+
+
+def plan_chunks(df, layout, chunk_size=CHUNK_SIZE):
+    """Yield (title, task) in write order: one task per chunk of rows, at least one per sheet."""
+    for title, builder, spec, positions in expand_layout(df, layout):
+        if builder is summary_sheet:
+            yield title, partial(_summary_rows, df, spec)
+            continue
+        source, columns, positions = fund_sheet(df, spec, positions)
+        for start in range(0, max(len(positions), 1), chunk_size):
+            yield title, partial(_rows, source, columns, positions[start:start + chunk_size])
+
+
+def iter_chunks(df, layout, chunk_size=CHUNK_SIZE, workers=None):
+    """Yield (title, columns, rows) chunks in write order.
+
+    Chunk materialisation (slicing, dtype conversion, tolist) runs in a thread
+    pool a bounded window ahead of the writer, so it overlaps with ws.append
+    and memory stays at a few chunks regardless of report size. One worker is
+    the default: the GIL means extra threads mostly contend with the writer.
+    """
+    validate_layout(layout, df.columns)
+    window = workers or 1
+    with ThreadPoolExecutor(max_workers=window) as pool:
+        pending = deque()
+        for title, task in plan_chunks(df, layout, chunk_size):
+            pending.append((title, pool.submit(task)))
+            if len(pending) > window:
+                title, future = pending.popleft()
+                yield (title, *future.result())
+        while pending:
+            title, future = pending.popleft()
+            yield (title, *future.result())
+
+
+def export_workbook(df, path, layout=DEFAULT_LAYOUT, chunk_size=CHUNK_SIZE, workers=None):
+    """Stream the layout's sheets into a write-only workbook at `path`. Returns the sheet count."""
+    wb = Workbook(write_only=True)
+    bold = Font(bold=True)
+    ws, sheets = None, 0
+    for title, columns, rows in iter_chunks(df, layout, chunk_size, workers):
+        if ws is None or ws.title != title:
+            ws = wb.create_sheet(title)
+            ws.freeze_panes = "A2"
+            header = []
+            for col in columns:
+                cell = WriteOnlyCell(ws, value=col)
+                cell.font = bold
+                header.append(cell)
+            ws.append(header)
+            sheets += 1
+        for row in rows:
+            ws.append(row)
+
+    wb.save(path)
+    return sheets
+
+
+def export_workbook_to_excel(df, path, layout=DEFAULT_LAYOUT):
+    """Reference path: same sheets written through DataFrame.to_excel (in-memory workbook)."""
+    sheets = 0
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        validate_layout(layout, df.columns)
+        for title, builder, spec, positions in expand_layout(df, layout):
+            source, columns, positions = builder(df, spec, positions)
+            source.iloc[positions][columns].to_excel(writer, index=False, sheet_name=title)
+            sheets += 1
+    return sheets
+
+
+def _measure(fn, *args, **kwargs):
+    """Run `fn` twice: once for wall time, once under tracemalloc for peak memory
+    (tracing slows allocation-heavy code too much to time both in one pass)."""
+    started = time.perf_counter()
+    fn(*args, **kwargs)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    result = fn(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def benchmark(df, layout=DEFAULT_LAYOUT, chunk_size=CHUNK_SIZE):
+    """Time and peak traced memory of the streaming export vs the to_excel path."""
+    print("\n⏱️  Benchmark: streaming writer vs DataFrame.to_excel")
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, fn, kwargs in [
+            ("to_excel", export_workbook_to_excel, {}),
+            ("streaming", export_workbook, {"chunk_size": chunk_size}),
+        ]:
+            path = os.path.join(tmp, f"{label}.xlsx")
+            sheets, elapsed, peak = _measure(fn, df, path, layout, **kwargs)
+            results[label] = {
+                "seconds": round(elapsed, 2),
+                "peak_mb": round(peak / 1024 ** 2, 1),
+                "file_mb": round(os.path.getsize(path) / 1024 ** 2, 2),
+                "sheets": sheets,
+            }
+            r = results[label]
+            print(f"   {label:<10} | {r['sheets']} sheets | {r['seconds']:>7.2f} s | "
+                  f"peak {r['peak_mb']:>7.1f} MB | file {r['file_mb']:.2f} MB")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the ranked fund universe to a multi-sheet Excel report.")
+    parser.add_argument("--input", default=os.path.join(DATA_DIR, "mutual_funds_processed.csv"),
+                        help="processed CSV from analyze.py")
+    parser.add_argument("--output", default=os.path.join(DATA_DIR, "mutual_funds_report.xlsx"))
+    parser.add_argument("--layout", help="JSON file with a list of sheet specs (default: built-in layout)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="threads converting row chunks ahead of the writer (default 1)")
+    parser.add_argument("--benchmark", action="store_true", help="compare against the to_excel path")
+    args = parser.parse_args()
+
+    layout = load_layout(args.layout) if args.layout else DEFAULT_LAYOUT
+    df = pd.read_csv(args.input)
+    print(f"📂 Loaded {len(df)} records from {os.path.basename(args.input)}")
+
+    started = time.perf_counter()
+    sheets = export_workbook(df, args.output, layout, args.chunk_size, args.workers)
+    print(f"   ✅ Excel report: {args.output} ({sheets} sheets, {time.perf_counter() - started:.2f} s)")
+
+    if args.benchmark:
+        benchmark(df, layout, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Live Re-Analysis (Watch Mode)
+- Polls the data files for changes
+- Debounces bursts of writes into a single job
+- Reruns only the affected pipeline stages in a background worker
+- Diffs the new dashboard data against the previous one
+- Hands small diffs to a broadcaster (see run_dashboard.py --watch)
+- Refreshes the Excel report in the background, after the push
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+
+import pandas as pd
+
+import analyze
+from analyze import DATA_DIR
+
+RAW_PATH = os.path.join(DATA_DIR, "mutual_funds_raw.csv")
+PROCESSED_PATH = os.path.join(DATA_DIR, "mutual_funds_processed.csv")
+DASHBOARD_PATH = os.path.join(DATA_DIR, "dashboard_data.json")
+
+# Which pipeline stages a change to each watched file invalidates.
+#   raw       → clean, normalize, score, top 30, all outputs
+#   processed → top 30 + dashboard JSON only (scores are already in the file)
+# Either way the Excel report is refreshed afterwards by ReportWorker.
+STAGES_BY_FILE = {
+    RAW_PATH: "analyze",
+    PROCESSED_PATH: "dashboard",
+}
+
+# Dashboard keys pushed as whole values when they change
+AGGREGATE_KEYS = [
+    "returns_by_category", "aum_by_fund_type", "top_amcs", "fund_managers",
+    "expense_by_strategy", "risk_distribution", "rating_distribution",
+    "sip_by_type", "lumpsum_by_type", "category_counts", "top_30", "filters",
+]
+
+FUND_KEY = "Scheme Name"
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def _normalize(data):
+    """Round-trip through JSON so diffs compare exactly what the browser sees."""
+    return json.loads(json.dumps(data, ensure_ascii=False))
+
+
+def diff_dashboard(old, new):
+    """Return only the parts of `new` that differ from `old`."""
+    diff = {}
+
+    kpis = {k: v for k, v in new["kpis"].items() if old["kpis"].get(k) != v}
+    if kpis:
+        diff["kpis"] = kpis
+
+    aggregates = {k: new[k] for k in AGGREGATE_KEYS if old.get(k) != new.get(k)}
+    if aggregates:
+        diff["aggregates"] = aggregates
+
+    # Funds: new rows go out in full, existing rows only with the fields that changed
+    old_funds = {f[FUND_KEY]: f for f in old["all_funds"]}
+    upsert = {}
+    for fund in new["all_funds"]:
+        name = fund[FUND_KEY]
+        prev = old_funds.pop(name, None)
+        fields = fund if prev is None else {k: v for k, v in fund.items() if prev.get(k) != v}
+        if fields:
+            upsert[name] = fields
+    remove = list(old_funds)
+    if upsert or remove:
+        diff["funds"] = {"upsert": upsert, "remove": remove}
+
+    return diff
+
+
+class DataWatcher:
+    """Polls the watched files and emits one debounced job per burst of writes."""
+
+    def __init__(self, on_change, paths=None, interval=0.25, debounce=0.5):
+        self.on_change = on_change
+        self.paths = list(paths or STAGES_BY_FILE)
+        self.interval = interval
+        self.debounce = debounce
+        self.lock = threading.Lock()
+        self._mtimes = {}
+        self._pending = {}
+        self._last_event = 0.0
+        self._stop = threading.Event()
+        self.snapshot()
+
+    def snapshot(self, paths=None):
+        """Re-read mtimes, forgetting changes made by the pipeline itself."""
+        for path in paths or self.paths:
+            self._mtimes[path] = _mtime(path)
+
+    def poll(self):
+        with self.lock:
+            now = time.time()
+            for path in self.paths:
+                mtime = _mtime(path)
+                if mtime is not None and mtime != self._mtimes.get(path):
+                    self._mtimes[path] = mtime
+                    self._pending[path] = mtime
+                    self._last_event = now
+
+            if self._pending and now - self._last_event >= self.debounce:
+                changed, self._pending = self._pending, {}
+                self.on_change(changed, now)
+
+    def run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def start(self):
+        threading.Thread(target=self.run, name="data-watcher", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+
+class ReportWorker:
+    """Rewrites the Excel report off the live path.
+
+    Requests are coalesced: only the newest frame is kept, so a burst of
+    re-analyses produces one report from the latest data.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._latest = None
+        self._wake = threading.Event()
+
+    def request(self, df):
+        with self.lock:
+            self._latest = df
+        self._wake.set()
+
+    def run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self.lock:
+                df, self._latest = self._latest, None
+            if df is None:
+                continue
+
+            started = time.time()
+            try:
+                analyze.write_excel_report(df)
+            except Exception as err:
+                print(f"  ❌ Excel report failed: {err}")
+                continue
+            print(f"  📗 Excel report refreshed in {(time.time() - started) * 1000:.0f} ms")
+
+    def start(self):
+        threading.Thread(target=self.run, name="report-worker", daemon=True).start()
+
+
+class PipelineWorker:
+    """Reruns the affected analysis stages off the server thread and publishes diffs."""
+
+    def __init__(self, publish, excel_report=True):
+        self.publish = publish
+        self.jobs = queue.Queue()
+        self.watcher = DataWatcher(self.submit)
+        self.reports = ReportWorker() if excel_report else None
+        self.seq = 0
+        self.current = self._load_current()
+
+    def _load_current(self):
+        try:
+            with open(DASHBOARD_PATH, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def submit(self, changed, detected_at):
+        self.jobs.put((changed, detected_at))
+
+    def _drain(self, changed, detected_at):
+        """Coalesce jobs that queued up while the previous run was busy."""
+        while True:
+            try:
+                more, detected_at = self.jobs.get_nowait()
+            except queue.Empty:
+                return changed, detected_at
+            changed.update(more)
+
+    def run_stages(self, changed):
+        """Run the minimal set of stages for the changed files. Returns (df, dashboard data)."""
+        stages = {STAGES_BY_FILE[p] for p in changed}
+
+        if "analyze" in stages:
+            df = analyze.load_data()
+            df = analyze.clean_data(df)
+            df = analyze.normalize_data(df)
+            df = analyze.score_and_rank(df)
+            top_30 = analyze.extract_top_30(df)
+            return df, analyze.save_outputs(df, top_30)
+
+        df = pd.read_csv(PROCESSED_PATH, float_precision="round_trip")
+        top_30 = analyze.extract_top_30(df)
+        dashboard_data = analyze.generate_dashboard_data(df, top_30)
+        analyze.write_dashboard_json(dashboard_data)
+        return df, dashboard_data
+
+    def run(self):
+        while True:
+            changed, detected_at = self.jobs.get()
+            changed, detected_at = self._drain(changed, detected_at)
+            names = ", ".join(os.path.basename(p) for p in changed)
+            print(f"\n  🔄 Change detected: {names}")
+
+            started = time.time()
+            try:
+                # Hold the watcher lock so our own write of the processed CSV
+                # is not picked up as a fresh change. Only the "analyze" stage
+                # writes it; after a "dashboard" run it was the user's edit.
+                with self.watcher.lock:
+                    df, new = self.run_stages(changed)
+                    new = _normalize(new)
+                    if any(STAGES_BY_FILE[p] == "analyze" for p in changed):
+                        self.watcher.snapshot([PROCESSED_PATH])
+            except Exception as err:
+                print(f"  ❌ Re-analysis failed: {err}")
+                continue
+            finished = time.time()
+
+            self.push(changed, detected_at, started, finished, new)
+
+            # The report is slow (seconds); queue it only after the push
+            if self.reports:
+                self.reports.request(df)
+
+    def push(self, changed, detected_at, started, finished, new):
+        """Publish the diff between the current and the new dashboard data."""
+        old, self.current = self.current, new
+        if old is None:
+            self.seq += 1
+            self.publish({"type": "reload", "seq": self.seq})
+            return
+
+        diff = diff_dashboard(old, new)
+        if not diff:
+            print("  ✅ No dashboard changes")
+            return
+
+        self.seq += 1
+        written_at = max(changed.values())
+        pushed_at = time.time()
+        self.publish({
+            "type": "diff",
+            "seq": self.seq,
+            "diff": diff,
+            "timing": {
+                "written_at": written_at,
+                "detected_at": detected_at,
+                "analyzed_ms": round((finished - started) * 1000, 1),
+                "pushed_at": pushed_at,
+            },
+        })
+
+        rows = len(diff.get("funds", {}).get("upsert", [])) + len(diff.get("funds", {}).get("remove", []))
+        print(f"  ⚡ Pushed update #{self.seq}: {len(diff.get('kpis', {}))} KPIs, "
+              f"{len(diff.get('aggregates', {}))} aggregates, {rows} fund rows | "
+              f"write→push {(pushed_at - written_at) * 1000:.0f} ms "
+              f"(analysis {(finished - started) * 1000:.0f} ms)")
+
+    def start(self):
+        threading.Thread(target=self.run, name="pipeline-worker", daemon=True).start()
+        if self.reports:
+            self.reports.start()
+        self.watcher.start()
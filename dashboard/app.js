@@ -7,6 +7,9 @@ let DATA = null;
 let ALL_FUNDS = [];
 let FILTERED_FUNDS = [];
 let CHARTS = {};
+let LIVE_SEQ = null;
+let LIVE_BUFFER = null;   // diffs received while a full load is in flight
+let LIVE_STALE = false;   // another resync was requested during that load
 
 // ── CHART PALETTE ───────────────────────────────────────────
 const PALETTE = [
@@ -20,19 +23,18 @@ const PALETTE_ALPHA = PALETTE.map(c => c + '33');
 
 // ── INIT ────────────────────────────────────────────────────
 document.addEventListener('DOMContentLoaded', () => {
-    loadData();
+    setupEventListeners();
+    connectLiveUpdates();
 });
 
 async function loadData() {
     try {
-        const response = await fetch('../data/dashboard_data.json');
+        const response = await fetch('../data/dashboard_data.json', { cache: 'no-store' });
         DATA = await response.json();
         ALL_FUNDS = DATA.all_funds;
-        FILTERED_FUNDS = [...ALL_FUNDS];
 
         populateFilters();
-        updateDashboard();
-        setupEventListeners();
+        applyFilters();
 
         // Header badge
         document.getElementById('headerBadge').textContent =
@@ -44,6 +46,99 @@ async function loadData() {
     }
 }
 
+// ── LIVE UPDATES (run_dashboard.py --watch) ─────────────────
+// /events is opened before the first fetch: `hello` carries the server's
+// current seq and triggers the load, and diffs arriving meanwhile are
+// buffered and replayed on top of it (diffs hold absolute values, so
+// replaying one the JSON file already includes is harmless).
+function connectLiveUpdates() {
+    if (!window.EventSource) {
+        loadData();
+        return;
+    }
+    const source = new EventSource('/events');
+
+    // Watch mode off (204) or no live endpoint → plain static load
+    source.onerror = () => {
+        if (source.readyState === EventSource.CLOSED && !DATA) loadData();
+    };
+
+    source.addEventListener('hello', e => {
+        const { seq } = JSON.parse(e.data);
+        // First connect, or missed updates while disconnected → (re)load the JSON file
+        if (seq !== LIVE_SEQ) {
+            LIVE_SEQ = seq;
+            resync();
+        }
+    });
+
+    source.addEventListener('reload', e => {
+        LIVE_SEQ = JSON.parse(e.data).seq;
+        resync();
+    });
+
+    source.addEventListener('diff', e => {
+        const msg = JSON.parse(e.data);
+        if (msg.seq !== LIVE_SEQ + 1) {
+            LIVE_SEQ = msg.seq;
+            resync();
+            return;
+        }
+        LIVE_SEQ = msg.seq;
+        if (LIVE_BUFFER) LIVE_BUFFER.push(msg);
+        else applyLiveUpdate(msg);
+    });
+}
+
+async function resync() {
+    if (LIVE_BUFFER) {
+        LIVE_STALE = true;
+        return;
+    }
+    LIVE_BUFFER = [];
+    do {
+        LIVE_STALE = false;
+        await loadData();
+    } while (LIVE_STALE);
+
+    const pending = LIVE_BUFFER;
+    LIVE_BUFFER = null;
+    if (DATA) pending.forEach(applyLiveUpdate);
+}
+
+function applyLiveUpdate(msg) {
+    applyDiff(msg.diff);
+
+    // Latency: file write → server push → applied in the browser
+    const t = msg.timing;
+    const appliedMs = Date.now() - t.written_at * 1000;
+    console.info(`Live update #${msg.seq}: write→push ${Math.round((t.pushed_at - t.written_at) * 1000)} ms ` +
+        `(analysis ${Math.round(t.analyzed_ms)} ms), write→applied ${Math.round(appliedMs)} ms`);
+    document.getElementById('headerBadge').textContent =
+        `${DATA.kpis.total_funds} Schemes · Live (${Math.round(appliedMs)} ms)`;
+}
+
+function applyDiff(diff) {
+    if (diff.kpis) Object.assign(DATA.kpis, diff.kpis);
+    if (diff.aggregates) Object.assign(DATA, diff.aggregates);
+
+    if (diff.funds) {
+        const byName = new Map(ALL_FUNDS.map(f => [f['Scheme Name'], f]));
+        diff.funds.remove.forEach(name => byName.delete(name));
+        // Existing funds arrive with only their changed fields, new funds in full
+        Object.entries(diff.funds.upsert).forEach(([name, fields]) => {
+            const existing = byName.get(name);
+            if (existing) Object.assign(existing, fields);
+            else byName.set(name, fields);
+        });
+        ALL_FUNDS = [...byName.values()].sort((a, b) => a.Rank - b.Rank);
+        DATA.all_funds = ALL_FUNDS;
+    }
+
+    if (diff.aggregates && diff.aggregates.filters) populateFilters();
+    applyFilters();
+}
+
 // ── FILTERS ─────────────────────────────────────────────────
 function populateFilters() {
     const filters = DATA.filters;
@@ -57,6 +152,7 @@ function populateFilters() {
 function fillSelect(id, options) {
     const sel = document.getElementById(id);
     const defaultOpt = sel.options[0];
+    const selected = sel.value;
     sel.innerHTML = '';
     sel.appendChild(defaultOpt);
     options.forEach(opt => {
@@ -65,6 +161,8 @@ function fillSelect(id, options) {
         o.textContent = opt;
         sel.appendChild(o);
     });
+    // Keep the user's selection across live updates if it still exists
+    sel.value = options.map(String).includes(selected) ? selected : '';
 }
 
 function setupEventListeners() {
@@ -94,6 +192,8 @@ function applyFilters() {
         if (rating && String(f['Fund Rating']) !== rating) return false;
         return true;
     });
+    // Keep the table's column sort (also across live updates)
+    sortFunds();
 
     updateDashboard();
 }
@@ -597,7 +697,12 @@ function sortTable(th) {
     });
     th.classList.add(dir === 'asc' ? 'sort-asc' : 'sort-desc');
 
-    // Sort
+    sortFunds();
+    updateTable();
+}
+
+function sortFunds() {
+    const { key, dir } = currentSort;
     FILTERED_FUNDS.sort((a, b) => {
         let va = a[key], vb = b[key];
         if (typeof va === 'string') {
@@ -605,8 +710,6 @@ function sortTable(th) {
         }
         return dir === 'asc' ? va - vb : vb - va;
     });
-
-    updateTable();
 }
 
 // ── UTILITY ─────────────────────────────────────────────────
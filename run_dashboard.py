@@ -1,36 +1,137 @@
 """
 Simple HTTP server to launch the Mutual Fund Dashboard.
 Run: python run_dashboard.py
+     python run_dashboard.py --watch   (re-analyze on data changes and push live updates)
 """
+import argparse
 import http.server
+import json
+import queue
 import socketserver
+import sys
 import webbrowser
 import os
 import threading
 
 PORT = 8050
 DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+HEARTBEAT_SECONDS = 15
+
+
+class Broadcaster:
+    """Fans out live-update events to every connected Server-Sent Events client."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clients = []
+        self.seq = 0
+
+    def subscribe(self):
+        q = queue.Queue()
+        with self.lock:
+            self.clients.append(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self.lock:
+            if q in self.clients:
+                self.clients.remove(q)
+
+    def publish(self, event):
+        with self.lock:
+            self.seq = event["seq"]
+            for q in self.clients:
+                q.put(event)
 
 
 class Handler(http.server.SimpleHTTPRequestHandler):
+    broadcaster = None
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=DIRECTORY, **kwargs)
 
     def log_message(self, format, *args):
         pass  # Suppress logs
 
+    def do_GET(self):
+        if self.path == "/events":
+            self.stream_events()
+        else:
+            super().do_GET()
+
+    def stream_events(self):
+        # 204 tells EventSource not to reconnect when watch mode is off
+        if self.broadcaster is None:
+            self.send_response(204)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "keep-alive")
+        self.end_headers()
+
+        q = self.broadcaster.subscribe()
+        try:
+            self.send_event({"type": "hello", "seq": self.broadcaster.seq})
+            while True:
+                try:
+                    event = q.get(timeout=HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    self.wfile.write(b": ping\n\n")
+                    self.wfile.flush()
+                    continue
+                self.send_event(event)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.broadcaster.unsubscribe(q)
+
+    def send_event(self, event):
+        payload = json.dumps(event, ensure_ascii=False)
+        self.wfile.write(f"id: {event['seq']}\nevent: {event['type']}\ndata: {payload}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+
+class Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def start_watch_mode(excel_report=True):
+    """Start the file watcher + pipeline worker and wire them to the SSE broadcaster."""
+    sys.path.insert(0, os.path.join(DIRECTORY, "analysis"))
+    from watch import PipelineWorker
+
+    Handler.broadcaster = Broadcaster()
+    worker = PipelineWorker(Handler.broadcaster.publish, excel_report=excel_report)
+    worker.start()
+    print(f"  Watch mode: re-analyzing on changes to data/*.csv")
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Launch the Mutual Fund Dashboard.")
+    parser.add_argument("--watch", action="store_true",
+                        help="watch the data files, re-run the analysis and push live updates")
+    parser.add_argument("--no-report", action="store_true",
+                        help="in watch mode, do not refresh the Excel report after each update")
+    parser.add_argument("--no-browser", action="store_true", help="do not open a browser tab")
+    args = parser.parse_args()
+
     os.chdir(DIRECTORY)
-    with socketserver.TCPServer(("", PORT), Handler) as httpd:
+    with Server(("", PORT), Handler) as httpd:
         url = f"http://localhost:{PORT}/dashboard/index.html"
         print(f"\n  Mutual Fund Insights Dashboard")
         print(f"  {'=' * 40}")
         print(f"  Server running at: {url}")
+        if args.watch:
+            start_watch_mode(excel_report=not args.no_report)
         print(f"  Press Ctrl+C to stop\n")
 
         # Open browser after a short delay
-        threading.Timer(0.5, lambda: webbrowser.open(url)).start()
+        if not args.no_browser:
+            threading.Timer(0.5, lambda: webbrowser.open(url)).start()
 
         try:
             httpd.serve_forever()